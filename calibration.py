@@ -64,7 +64,7 @@ def run_calibration(win, hand='right', handedness='right'):
     win.flip()
     
     # Wait for space press
-    event.clearEvents()
+    event.clearEvents(eventType='keyboard')
     logging.data(f"[STRUCTURE] Starting calibration for {arrow_key} key using {physical_hand} hand")
     event.waitKeys(keyList=['space'])
     
@@ -98,7 +98,7 @@ def run_calibration(win, hand='right', handedness='right'):
     timer_text = visual.TextStim(win, text="", color='white', pos=(0, -0.2), height=0.06)
     
     # Clear all keyboard events before starting
-    event.clearEvents()
+    event.clearEvents(eventType='keyboard')
     
     # Track key state (to prevent holding)
     key_is_down = False
@@ -160,7 +160,7 @@ def run_calibration(win, hand='right', handedness='right'):
     win.flip()
     
     # Wait for space press
-    event.clearEvents()
+    event.clearEvents(eventType='keyboard')
     event.waitKeys(keyList=['space'])
     
     return count
\ No newline at end of file
@@ -30,6 +30,18 @@ ITI_RANGE = (1.0, 2.0)
 EASY_TASK_DURATION = 7.0   # seconds allowed for easy task
 HARD_TASK_DURATION = 21.0  # seconds allowed for hard task
 
+# Column order of the trial data CSV
+TRIAL_COLUMNS = (
+    'date', 'time', 'subject', 'handedness', 'practice_rounds_completed', 'trial_num', 
+    'domain', 'valence', 'snack_choice', 'magnitude_hard', 'probability', 'EV',
+    'choice', 'choice_rt', 'n_clicks_required', 'n_clicks_executed', 
+    'task_complete', 'is_catch', 'trial_type'
+)
+
+# Number of completed trials buffered before they are written to the CSV
+# (catch trials and interruptions always flush immediately)
+TRIAL_WRITE_BATCH_SIZE = 5
+
 # Calibration duration for each key press block (in seconds)
 CALIBRATION_DURATION = 10.5
 
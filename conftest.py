@@ -0,0 +1,6 @@
+"""
+Root pytest configuration.
+
+Its presence puts the repository root on sys.path, so tests can import the
+top-level experiment modules when run with plain ``pytest``.
+"""
@@ -6,7 +6,7 @@ import os
 import sys
 from psychopy import visual, core, event, logging
 from config import N_REAL_TRIALS_MONEY, N_REAL_TRIALS_FOOD, N_CATCH_TRIALS
-from utils import setup_logging, create_data_file, count_trials_in_file
+from utils import setup_logging, create_data_file
 from subject_info import get_subject_info
 import calibration
 import instructions
@@ -78,25 +78,32 @@ def main():
     Returns:
     None
     """
+    # Data file handle, closed in the finally clause on every exit path
+    trial_log = None
+    
     try:
         # Collect subject info FIRST
         info = get_subject_info()
         
+        # Resolve both hands once for the session; practice and main trials read them from info
+        dominant_hand = info['handedness'].upper()
+        info['dominant_hand'] = dominant_hand
+        info['non_dominant_hand'] = "LEFT" if dominant_hand == "RIGHT" else "RIGHT"
+        
         # Setup logging with subject info for matching filename
         setup_logging(info)
         logging.data('Starting experiment')
         logging.exp(f"Subject info: {info}")
         
-        # Create data file immediately
-        data_dir = os.path.join(os.getcwd(), 'data')
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir)
+        # Create data file immediately (get_subject_info already created data_dir)
+        data_dir = info['data_dir']
 
         data_file_path = os.path.join(data_dir, info['filename'])
         info['data_file_path'] = data_file_path
 
-        # Create empty CSV with headers
-        create_data_file(data_file_path)
+        # Create empty CSV with headers, kept open until the main trial block ends
+        trial_log = create_data_file(data_file_path)
+        info['trial_log'] = trial_log
         
         # Initialize window 
         win = visual.Window(
@@ -243,16 +250,19 @@ def main():
         show_phase_transition(win, "Main Experiment")  
         logging.data('[STRUCTURE] Running main experimental trials')
         try:
-            run_real_trials(win, info)
+            # Leaving the with block syncs and closes the data file, so it can
+            # be renamed below if the block was interrupted
+            with trial_log:
+                run_real_trials(win, info)
             # If we reach here, experiment completed successfully
             expected_trials = (N_REAL_TRIALS_MONEY if info['domain'] == 'Money' else N_REAL_TRIALS_FOOD) + N_CATCH_TRIALS
-            actual_trials = count_trials_in_file(data_file_path)
+            actual_trials = trial_log.n_rows
             logging.data(f'[STRUCTURE] Experiment completed successfully - {actual_trials} trials saved')
         except KeyboardInterrupt:
             # Handle early termination from real trials
             logging.data("Experiment terminated during main trials")
             expected_trials = (N_REAL_TRIALS_MONEY if info['domain'] == 'Money' else N_REAL_TRIALS_FOOD) + N_CATCH_TRIALS
-            actual_trials = count_trials_in_file(data_file_path)
+            actual_trials = trial_log.n_rows
             
             logging.data(f"[STRUCTURE] Expected: {expected_trials}, Actual: {actual_trials}")
     
@@ -306,6 +316,12 @@ def main():
             win.close()
         core.quit()
         raise
+    
+    finally:
+        # Sync and close the data file if the session ended (escape, quit or
+        # error) before the main trial block closed it
+        if trial_log is not None:
+            trial_log.close()
 
 # Allow keyboard interrupt to exit program
 if __name__ == '__main__':
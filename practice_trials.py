@@ -3,8 +3,44 @@ practice_trials.py
 Module for running practice trials in the effort-based decision task.
 """
 import random
+from dataclasses import dataclass
 from psychopy import visual, event, core, logging
-from config import PRACTICE_TRIALS
+from psychopy.hardware import keyboard
+from config import PRACTICE_TRIALS, EASY_TASK_DURATION, HARD_TASK_DURATION
+
+# Choice screen stimuli, built once per window (keyed by id(win))
+_choice_cache = {}
+
+# Fixation cross, built once per window (keyed by id(win))
+_fixation_stims = {}
+
+# Keyboard used by the choice screen and effort task loops, created on first use
+_keyboard = None
+
+# Pre-formatted timer ("0.0s" up to the longest task duration, indexed by
+# tenths of a second) and progress ("0%".."100%") strings for the effort task loops
+_TIMER_STRS = [
+    f"{i / 10:.1f}s"
+    for i in range(int(max(EASY_TASK_DURATION, HARD_TASK_DURATION) * 10 + 0.5) + 1)
+]
+_PCT_STRS = [f"{i}%" for i in range(101)]
+
+@dataclass(frozen=True)
+class TrialSpec:
+    """Fixed parameters for a single practice trial."""
+    __slots__ = (
+        'trial_num', 'probability', 'magnitude_hard', 'dominant_hand', 'non_dominant_hand',
+        'easy_clicks_required', 'hard_clicks_required', 'domain', 'valence'
+    )
+    trial_num: int
+    probability: float
+    magnitude_hard: float
+    dominant_hand: str
+    non_dominant_hand: str
+    easy_clicks_required: int
+    hard_clicks_required: int
+    domain: str
+    valence: str
 
 def run_practice_trials(win, info):
     """
@@ -17,74 +53,80 @@ def run_practice_trials(win, info):
         Subject information including handedness and calibration data
         
     Returns:
-    list
-        List of dictionaries containing trial data
+    None
     """
-    # Extract relevant information from info dictionary
-    handedness = info['handedness']
-    easy_clicks_required = info['easy_clicks_required']
-    hard_clicks_required = info['hard_clicks_required']
-    domain = info['domain']
-    valence = info['valence']
-    dominant_hand = handedness.upper()
-    
-    # Get non-dominant hand
-    non_dominant_hand = "LEFT" if dominant_hand == "RIGHT" else "RIGHT"
+    # Build the session state and reusable stimuli once for all trials
+    runner = _PracticeRunner(win, info)
     
     # Run all three practice trials using config parameters
     for trial_num, trial_config in enumerate(PRACTICE_TRIALS, 1):
-        run_practice_trial(
-            win, 
-            trial_num, 
-            trial_config['prob'], 
-            trial_config['magnitude_hard'],
-            non_dominant_hand,
-            easy_clicks_required,
-            hard_clicks_required,
-            domain,
-            valence,
-            info
+        runner.run_trial(trial_num, trial_config)
+
+class _PracticeRunner:
+    """
+    Session state for a block of practice trials.
+    
+    Extracts the subject information once and builds the window-bound
+    choice stimuli and keyboard before the first trial, so each trial only
+    mutates existing objects.
+    """
+    
+    def __init__(self, win, info):
+        self.win = win
+        self.info = info
+        
+        # Extract relevant information from info dictionary
+        self.easy_clicks_required = info['easy_clicks_required']
+        self.hard_clicks_required = info['hard_clicks_required']
+        self.domain = info['domain']
+        self.valence = info['valence']
+        self.dominant_hand = info['dominant_hand']
+        self.non_dominant_hand = info['non_dominant_hand']
+        
+        # Warm the stimulus and keyboard caches before trial 1
+        get_choice_stims(win)
+        _get_keyboard()
+    
+    def run_trial(self, trial_num, trial_config):
+        """Run one practice trial from its PRACTICE_TRIALS entry."""
+        spec = TrialSpec(
+            trial_num=trial_num,
+            probability=trial_config['prob'],
+            magnitude_hard=trial_config['magnitude_hard'],
+            dominant_hand=self.dominant_hand,
+            non_dominant_hand=self.non_dominant_hand,
+            easy_clicks_required=self.easy_clicks_required,
+            hard_clicks_required=self.hard_clicks_required,
+            domain=self.domain,
+            valence=self.valence
         )
+        run_practice_trial(self.win, spec, self.info)
 
-def run_practice_trial(win, trial_num, probability, magnitude_hard, non_dominant_hand, easy_clicks_required, hard_clicks_required, domain, valence, info):
+def run_practice_trial(win, spec, info):
     """
     Run a single practice trial with given parameters.
     
     Parameters:
     win : psychopy.visual.Window
         Window to display stimuli
-    trial_num : int
-        Trial number (1, 2, or 3)
-    probability : float
-        Probability of loss/gain
-    magnitude_hard : float
-        Magnitude for the hard option
-    non_dominant_hand : str
-        The participant's non-dominant hand
-    easy_clicks_required : int
-        Number of clicks required for easy task
-    hard_clicks_required : int
-        Number of clicks required for the hard task
-    domain : str
-        'Money' or 'Food'
-    valence : str
-        'Gain' or 'Loss'
+    spec : TrialSpec
+        Trial number, probability, hard magnitude, hands and click
+        requirements, domain and valence for this trial
+    info : dict
+        Subject information (used for snack choice)
         
     Returns:
-    dict
-        Dictionary containing trial data
+    None
     """
-
-    # TODO: Calculate dominant hand from non-dominant (REDUNDANT)
-    dominant_hand = "RIGHT" if non_dominant_hand == "LEFT" else "LEFT" 
-
     # Show fixation cross
     show_fixation(win)
     
     # Show choice screen and get response
-    choice, choice_rt = show_choice_screen(win, probability, magnitude_hard, domain, valence, info)
+    choice, choice_rt = show_choice_screen(
+        win, spec.probability, spec.magnitude_hard, spec.domain, spec.valence, info
+    )
     if choice == 'timeout':
-        logging.data(f"Practice trial {trial_num} skipped due to timeout")
+        logging.data(f"Practice trial {spec.trial_num} skipped due to timeout")
         return 
     
     # Show ready screen
@@ -92,69 +134,34 @@ def run_practice_trial(win, trial_num, probability, magnitude_hard, non_dominant
     
     # Execute the chosen task
     if choice == 'easy':
-        task_complete, clicks_executed = run_easy_task(win, dominant_hand, easy_clicks_required) #
+        task_complete, clicks_executed = run_easy_task(win, spec.dominant_hand, spec.easy_clicks_required)
     else:
-        task_complete, clicks_executed = run_hard_task(win, non_dominant_hand, hard_clicks_required)
+        task_complete, clicks_executed = run_hard_task(win, spec.non_dominant_hand, spec.hard_clicks_required)
     
     # Show task completion status
     show_completion_status(win, task_complete)
 
-def show_fixation(win):
-    """Show fixation cross."""
-    fixation = visual.TextStim(win, text="+", height=0.08, color='white')
-    fixation.draw()
-    win.flip()
-    core.wait(1.0)
-
-def show_choice_screen(win, probability, magnitude_hard, domain, valence, info):
+def get_choice_stims(win):
     """
-    Display choice screen and get participant's response.
+    Return the choice screen stimuli for this window, building them on first use.
+    
+    Only the probability and value texts change between trials, so every
+    stimulus is created once per window and reused. Shared by the practice
+    and main choice screens.
     
     Parameters:
     win : psychopy.visual.Window
         Window to display stimuli
-    probability : float
-        Probability of loss/gain
-    magnitude_hard : float
-        Magnitude for hard option
-    domain : str
-        'Money' or 'Food'
-    valence : str
-        'Gain' or 'Loss'
-    
+        
     Returns:
-    (str, float)
-        Tuple of (choice, reaction_time)
+    dict
+        Stimuli keyed by name, plus 'elements' (draw order of the static
+        screen) and 'border_box' (red confirmation border)
     """
-    # new line to ensure snack_packs is valid
-    snack_packs = None
-    # Set correct easy values and display format based on valence
-    if valence == 'Loss':
-        easy_value = 4.00
-        if domain == 'Money':
-            easy_display = f"-${easy_value:.2f}"
-            hard_display = f"-${magnitude_hard:.2f}"
-            prob_label = f"Probability of loss: {int(probability * 100)}%"
-        else:  # Food
-            snack_name = info.get('snack_choice', 'snacks')
-            snack_packs = f"{snack_name.lower()} packs"
-            easy_display = f"-{int(easy_value)} {snack_packs}"
-            hard_display = f"-{int(magnitude_hard)} {snack_packs}"
-            prob_label = f"Probability of loss: {int(probability * 100)}%"
-    else:  # Gain
-        easy_value = 1.00
-        if domain == 'Money':
-            easy_display = f"+${easy_value:.2f}"
-            hard_display = f"+${magnitude_hard:.2f}"
-            prob_label = f"Probability of gain: {int(probability * 100)}%"
-        else:  # Food
-            snack_name = info.get('snack_choice', 'snacks')
-            snack_packs = f"{snack_name.lower()} packs"
-            easy_display = f"+{int(easy_value)} {snack_packs}"
-            hard_display = f"+{int(magnitude_hard)} {snack_packs}"
-            prob_label = f"Probability of gain: {int(probability * 100)}%"
+    key = id(win)
+    if key in _choice_cache:
+        return _choice_cache[key]
     
-    # Create visual elements
     elements = []
     
     # Gray background box for choices - full screen
@@ -190,7 +197,7 @@ def show_choice_screen(win, probability, magnitude_hard, domain, valence, info):
     # Probability text
     probability_text = visual.TextStim(
         win,
-        text=prob_label,
+        text="",
         pos=(0, 0.15), # y was 0.0
         height=0.035,
         color='white'
@@ -221,7 +228,7 @@ def show_choice_screen(win, probability, magnitude_hard, domain, valence, info):
     
     easy_value_display = visual.TextStim(
         win,
-        text=easy_display,
+        text="",
         pos=(-0.35, -0.20),
         height=0.04,
         color='black'
@@ -261,7 +268,7 @@ def show_choice_screen(win, probability, magnitude_hard, domain, valence, info):
     
     hard_value_display = visual.TextStim(
         win,
-        text=hard_display,
+        text="",
         pos=(0.35, -0.20),
         height=0.04,
         color='black'
@@ -277,42 +284,133 @@ def show_choice_screen(win, probability, magnitude_hard, domain, valence, info):
     )
     elements.append(hard_key)
     
-    # Draw all elements
-    for element in elements:
-        element.draw()
+    # Red confirmation border, repositioned for each choice
+    border_box = visual.Rect(
+        win,
+        width=0.35,
+        height=0.18,
+        fillColor=None,
+        lineColor='red',
+        lineWidth=3
+    )
+    
+    stims = {
+        'elements': tuple(elements),
+        'probability_text': probability_text,
+        'easy_value': easy_value_display,
+        'hard_value': hard_value_display,
+        'border_box': border_box
+    }
+    _choice_cache[key] = stims
+    return stims
+
+def _get_keyboard():
+    """Return the shared PTB-backed keyboard used for choices and key presses."""
+    global _keyboard
+    if _keyboard is None:
+        _keyboard = keyboard.Keyboard(backend='ptb')
+    return _keyboard
+
+def show_fixation(win):
+    """Show fixation cross."""
+    fixation = _fixation_stims.get(id(win))
+    if fixation is None:
+        fixation = visual.TextStim(win, text="+", height=0.08, color='white')
+        _fixation_stims[id(win)] = fixation
+    fixation.draw()
     win.flip()
+    core.wait(1.0)
+
+def show_choice_screen(win, probability, magnitude_hard, domain, valence, info):
+    """
+    Display choice screen and get participant's response.
     
-    # Wait for response and record time
-    choice_start_time = core.getTime()
-    choice_keys = event.waitKeys(keyList=['left', 'right', 'escape'], maxWait=30.0)
+    Parameters:
+    win : psychopy.visual.Window
+        Window to display stimuli
+    probability : float
+        Probability of loss/gain
+    magnitude_hard : float
+        Magnitude for hard option
+    domain : str
+        'Money' or 'Food'
+    valence : str
+        'Gain' or 'Loss'
+    
+    Returns:
+    (str, float)
+        Tuple of (choice, reaction_time)
+    """
+    # new line to ensure snack_packs is valid
+    snack_packs = None
+    # Set correct easy values and display format based on valence
+    if valence == 'Loss':
+        easy_value = 4.00
+        if domain == 'Money':
+            easy_display = f"-${easy_value:.2f}"
+            hard_display = f"-${magnitude_hard:.2f}"
+            prob_label = f"Probability of loss: {int(probability * 100)}%"
+        else:  # Food
+            snack_name = info.get('snack_choice', 'snacks')
+            snack_packs = f"{snack_name.lower()} packs"
+            easy_display = f"-{int(easy_value)} {snack_packs}"
+            hard_display = f"-{int(magnitude_hard)} {snack_packs}"
+            prob_label = f"Probability of loss: {int(probability * 100)}%"
+    else:  # Gain
+        easy_value = 1.00
+        if domain == 'Money':
+            easy_display = f"+${easy_value:.2f}"
+            hard_display = f"+${magnitude_hard:.2f}"
+            prob_label = f"Probability of gain: {int(probability * 100)}%"
+        else:  # Food
+            snack_name = info.get('snack_choice', 'snacks')
+            snack_packs = f"{snack_name.lower()} packs"
+            easy_display = f"+{int(easy_value)} {snack_packs}"
+            hard_display = f"+{int(magnitude_hard)} {snack_packs}"
+            prob_label = f"Probability of gain: {int(probability * 100)}%"
+    
+    # Fill in the trial-specific text on the cached choice screen stimuli
+    stims = get_choice_stims(win)
+    stims['probability_text'].text = prob_label
+    stims['easy_value'].text = easy_display
+    stims['hard_value'].text = hard_display
+    
+    # Drop any presses made before the choice screen appears; waitKeys below
+    # must not clear again or it could drop a press made right after the flip
+    kb = _get_keyboard()
+    kb.clearEvents()
+    
+    # Draw the choice screen; the keyboard clock is reset at the flip itself
+    # so RTs are measured from the actual screen onset
+    elements = stims['elements']
+    for stim in elements:
+        stim.draw()
+    win.callOnFlip(kb.clock.reset)
+    win.flip()
+    
+    # Wait for response; RT comes from the keyboard's own timestamps
+    choice_keys = kb.waitKeys(
+        maxWait=30.0, keyList=['left', 'right', 'escape'], waitRelease=False, clear=False
+    )
     if choice_keys is None:
         logging.warning("No response for 30 seconds - skipping trial due to timeout")
         return 'timeout', 30.0  # Return special timeout indicators
-
-    choice_end_time = core.getTime()
     
     # Check for escape key
-    if 'escape' in choice_keys:
+    if any(key.name == 'escape' for key in choice_keys):
         raise KeyboardInterrupt("User pressed escape during practice trial")
         
     # Record choice and reaction time
-    choice = 'easy' if choice_keys[0] == 'left' else 'hard'
-    choice_rt = choice_end_time - choice_start_time
+    choice = 'easy' if choice_keys[0].name == 'left' else 'hard'
+    choice_rt = choice_keys[0].rt
     
     # Show confirmation with red border
-    border_box = visual.Rect(
-        win,
-        width=0.35,
-        height=0.18,
-        fillColor=None,
-        lineColor='red',
-        lineWidth=3,
-        pos=(-0.35, -0.15) if choice == 'easy' else (0.35, -0.15)
-    )
+    border_box = stims['border_box']
+    border_box.pos = (-0.35, -0.15) if choice == 'easy' else (0.35, -0.15)
     
-    # Redraw everything with highlight
-    for element in elements:
-        element.draw()
+    # Redraw the screen with highlight
+    for stim in elements:
+        stim.draw()
     border_box.draw()
     win.flip()
     
@@ -364,7 +462,11 @@ def show_completion_status(win, task_complete):
     status_bg.draw()
     completion_text.draw()
     win.flip()
-    core.wait(2.0)
+    
+    # Hold the status for up to 2 seconds; the experimenter can skip with ENTER.
+    # ESC is not handled here: in the main block the trial is not yet saved,
+    # so aborting on this screen would lose a completed trial
+    event.waitKeys(maxWait=2.0, keyList=['return'])
 
 def run_easy_task(win, dominant_hand, easy_clicks_required):
     """
@@ -382,97 +484,18 @@ def run_easy_task(win, dominant_hand, easy_clicks_required):
     (bool, int)
         Tuple containing (task_complete, clicks_executed)
     """
-    # Initialize variables
-    clicks_executed = 0
-    task_complete = False
-    task_duration = 7.0  # 7 seconds for easy task
-    
-    # Create visual elements that don't change
-    progress_bar_back = visual.Rect(
-        win,
-        width=0.1,
-        height=0.6,
-        fillColor='darkgrey',
-        lineColor='white',
-        pos=(0, 0)
-    )
-    
-    task_text = visual.TextStim(
-        win,
-        text=f"Press the space bar with your {dominant_hand} index finger",
-        pos=(0, -0.4),
-        height=0.05,
-        color='white'
-    )
+    task_duration = EASY_TASK_DURATION
     
     # Clear any existing keypresses
-    event.clearEvents()
+    _get_keyboard().clearEvents()
     
     # Set up timer
-    start_time = core.getTime()
-    end_time = start_time + task_duration
+    end_time = core.getTime() + task_duration
     
-    # Task loop
-    while core.getTime() < end_time and clicks_executed < easy_clicks_required:
-        # Check for keypresses
-        keys = event.getKeys(keyList=['space', 'escape'])
-        
-        # Check for escape key
-        if 'escape' in keys:
-            raise KeyboardInterrupt("User pressed escape during easy task")
-            
-        # Count spacebar presses
-        if 'space' in keys:
-            clicks_executed += 1
-            
-        # Calculate progress
-        progress = min(1.0, clicks_executed / easy_clicks_required)
-        new_height = 0.6 * progress
-        
-        # Update progress bar
-        progress_bar_fill = visual.Rect(
-            win,
-            width=0.1,
-            height=new_height,
-            fillColor='blue',
-            lineColor=None,
-            pos=(0, -0.3 + new_height/2)
-        )
-        
-        # Update progress text
-        progress_text = visual.TextStim(
-            win,
-            text=f"{int(progress * 100)}%",
-            pos=(0.15, 0),
-            height=0.05,
-            color='white'
-        )
-        
-        # Update timer
-        time_remaining = max(0, end_time - core.getTime())
-        timer_text = visual.TextStim(
-            win,
-            text=f"{time_remaining:.1f}s",
-            pos=(0.8, -0.8),
-            height=0.04,
-            color='white'
-        )
-        
-        # Draw elements
-        progress_bar_back.draw()
-        progress_bar_fill.draw()
-        progress_text.draw()
-        task_text.draw()
-        timer_text.draw()
-        win.flip()
-        
-        # Brief wait to prevent CPU hogging
-        core.wait(0.001)
-    
-    # Check if task was completed
-    task_complete = clicks_executed >= easy_clicks_required
-    
-    return task_complete, clicks_executed
+    return _run_click_task(
+        win, 'space', f"Press the space bar with your {dominant_hand} index finger",
+        'easy', 0, easy_clicks_required, end_time
+    )
 
 def run_hard_task(win, non_dominant_hand, hard_clicks_required):
     """
@@ -494,11 +517,11 @@ def run_hard_task(win, non_dominant_hand, hard_clicks_required):
     # Initialize variables
     right_clicks = 0
     left_clicks = 0
-    task_duration = 21.0  # 21 seconds for hard task
+    task_duration = HARD_TASK_DURATION
     clicks_per_side = hard_clicks_required // 2  # Split between left and right
     
     # Clear any existing keypresses
-    event.clearEvents()
+    _get_keyboard().clearEvents()
     
     # Set up timer
     start_time = core.getTime()
@@ -534,6 +557,43 @@ def execute_hard_task_phase(win, key_name, key_display, current_clicks, required
     (bool, int)
         Tuple of (phase_complete, clicks_executed)
     """
+    return _run_click_task(
+        win, key_name, f"Press the {key_display} arrow key with your {non_dominant_hand} pinky finger",
+        'hard', current_clicks, required_clicks, end_time
+    )
+
+def _tenths_remaining(end_time, now):
+    """
+    Return the time left before end_time in whole tenths of a second.
+    
+    Both times must come from core.getTime(). The result indexes _TIMER_STRS.
+    """
+    return int(max(0, end_time - now) * 10 + 0.5)
+
+def _run_click_task(win, key_name, label_text, task_name, current_clicks, required_clicks, end_time):
+    """
+    Run the shared press-counting loop used by the easy task and each hard task phase.
+    
+    Parameters:
+    win : psychopy.visual.Window
+        Window to display stimuli
+    key_name : str
+        Key to count ('space', 'left' or 'right')
+    label_text : str
+        Instruction shown below the progress bar
+    task_name : str
+        'easy' or 'hard', used in the escape message
+    current_clicks : int
+        Number of presses already counted
+    required_clicks : int
+        Number of presses needed to complete
+    end_time : float
+        core.getTime() value at which the task times out
+        
+    Returns:
+    (bool, int)
+        Tuple of (complete, clicks_executed)
+    """
     clicks = current_clicks
     
     # Create visual elements that don't change
@@ -541,63 +601,94 @@ def execute_hard_task_phase(win, key_name, key_display, current_clicks, required
         win,
         width=0.1,
         height=0.6,
-        fillColor='darkgrey',
-        lineColor='white',
+        fillColor='silver',  # No outline; lighter fill keeps the bar edge visible
+        lineColor=None,
         pos=(0, 0)
     )
     
     task_text = visual.TextStim(
         win,
-        text=f"Press the {key_display} arrow key with your {non_dominant_hand} pinky finger",
+        text=label_text,
         pos=(0, -0.4),
         height=0.05,
         color='white'
     )
     
-    while core.getTime() < end_time and clicks < required_clicks:
-        # Check for keypresses
-        keys = event.getKeys(keyList=[key_name, 'escape'])
+    # Create visual elements that change every frame once; only their
+    # attributes are updated inside the loop. The fill is a unit square
+    # scaled through .size, so updates don't rebuild its vertices
+    progress_bar_fill = visual.Rect(
+        win,
+        width=1.0,
+        height=1.0,
+        fillColor='blue',
+        lineColor=None,
+        pos=(0, -0.3)
+    )
+    progress_bar_fill.size = (0.1, 0.0)
+    
+    progress_text = visual.TextStim(
+        win,
+        text="0%",
+        pos=(0.15, 0),
+        height=0.05,
+        color='white'
+    )
+    
+    timer_text = visual.TextStim(
+        win,
+        text="",
+        pos=(0.8, -0.8),
+        height=0.04,
+        color='white'
+    )
+    progress_pct = 0
+    prev_tenths = -1
+    
+    # Presses are read from the keyboard's own buffer; the screen is only
+    # redrawn when the count or the displayed time changes
+    kb = _get_keyboard()
+    prev_clicks = -1
+    
+    now = core.getTime()
+    while now < end_time and clicks < required_clicks:
+        # Check for keypresses since the last frame
+        presses = kb.getKeys(keyList=[key_name, 'escape'], waitRelease=False)
         
-        # Check for escape key
-        if 'escape' in keys:
-            raise KeyboardInterrupt("User pressed escape during hard task")
-            
-        # Count arrow presses
-        if key_name in keys:
+        # Check for escape key and count task key presses in one pass;
+        # keyList guarantees anything other than escape is the task key
+        for press in presses:
+            if press.name == 'escape':
+                raise KeyboardInterrupt(f"User pressed escape during {task_name} task")
             clicks += 1
         
-        # Calculate progress
-        progress = min(1.0, clicks / required_clicks)
-        new_height = 0.6 * progress
-        
-        # Update progress bar
-        progress_bar_fill = visual.Rect(
-            win,
-            width=0.1,
-            height=new_height,
-            fillColor='blue',
-            lineColor=None,
-            pos=(0, -0.3 + new_height/2)
-        )
+        # Skip the redraw when neither the count nor the timer has changed
+        tenths = _tenths_remaining(end_time, now)
+        if clicks == prev_clicks and tenths == prev_tenths:
+            core.wait(0.005, hogCPUperiod=0)
+            now = core.getTime()
+            continue
         
-        # Update progress text
-        progress_text = visual.TextStim(
-            win,
-            text=f"{int(progress * 100)}%",
-            pos=(0.15, 0),
-            height=0.05,
-            color='white'
-        )
+        # Calculate progress
+        if clicks != prev_clicks:
+            prev_clicks = clicks
+            progress = min(1.0, clicks / required_clicks)
+            new_height = 0.6 * progress
+            
+            # Update progress bar
+            progress_bar_fill.size = (0.1, new_height)
+            progress_bar_fill.pos = (0, -0.3 + new_height/2)
+            
+            # Update progress text only when the displayed percentage changes
+            new_pct = int(progress * 100)
+            if new_pct != progress_pct:
+                progress_pct = new_pct
+                progress_text.text = _PCT_STRS[progress_pct]
         
         # Update timer
-        time_remaining = max(0, end_time - core.getTime())
-        timer_text = visual.TextStim(
-            win,
-            text=f"{time_remaining:.1f}s",
-            pos=(0.8, -0.8),
-            height=0.04,
-            color='white'
-        )
+        if tenths != prev_tenths:
+            prev_tenths = tenths
+            timer_text.text = _TIMER_STRS[tenths]
         
         # Draw elements
         progress_bar_back.draw()
@@ -605,10 +696,11 @@ def execute_hard_task_phase(win, key_name, key_display, current_clicks, required
         progress_text.draw()
         task_text.draw()
         timer_text.draw()
-        win.flip()
         
-        # Brief wait to prevent CPU hogging
-        core.wait(0.001)
+        # end_time is on the core.getTime() base, so read that clock (not
+        # the flip timestamp, which comes from logging's default clock)
+        win.flip()
+        now = core.getTime()
     
-    phase_complete = clicks >= required_clicks
-    return phase_complete, clicks
\ No newline at end of file
+    complete = clicks >= required_clicks
+    return complete, clicks
\ No newline at end of file
@@ -2,19 +2,27 @@
 real_trials.py
 Module for running the main experimental trials in the effort-based decision task.
 """
-import random
-from datetime import datetime
+import numpy as np
 from psychopy import visual, event, core, logging
 from config import (
-    MONEY_MAGNITUDES, FOOD_MAGNITUDES, PROBABILITIES, ITI_RANGE,
-    N_REAL_TRIALS_MONEY, N_REAL_TRIALS_FOOD, N_CATCH_TRIALS, CATCH_TRIAL_CONFIGS,
-    LOSS_EASY_VALUE, LOSS_HARD_VALUE, GAIN_EASY_VALUE, GAIN_HARD_VALUE
+    PROBABILITIES, ITI_RANGE,
+    N_REAL_TRIALS_MONEY, N_REAL_TRIALS_FOOD, CATCH_TRIAL_CONFIGS,
+    LOSS_EASY_VALUE, LOSS_HARD_VALUE, GAIN_EASY_VALUE, GAIN_HARD_VALUE,
+    TRIAL_WRITE_BATCH_SIZE, TRIAL_COLUMNS
 )
 from practice_trials import (
-    show_fixation, show_ready_screen, show_completion_status,
-    run_easy_task, run_hard_task
+    show_fixation, show_ready_screen, show_completion_status, run_easy_task, run_hard_task,
+    get_choice_stims
 )
-from utils import append_trial_data
+from utils import now_strings
+from trial_list import generate_trial_list
+
+# Empty trial data row in CSV column order, copied for each trial
+_TRIAL_TEMPLATE = dict.fromkeys(TRIAL_COLUMNS)
+_TRIAL_TEMPLATE.update(n_clicks_executed=0, task_complete=0)
+
+# Choice confirmation borders, built once per window (keyed by id(win))
+_choice_borders = {}
 
 def run_real_trials(win, info):
     """
@@ -24,7 +32,8 @@ def run_real_trials(win, info):
     win : psychopy.visual.Window
         Window to display stimuli
     info : dict
-        Subject information including domain, valence, handedness, etc.
+        Subject information including domain, valence, handedness, etc.,
+        plus the open 'trial_log' from create_data_file
         
     Returns:
     list
@@ -38,19 +47,34 @@ def run_real_trials(win, info):
     hard_clicks_required = info['hard_clicks_required']
     subject_number = info['subject_number']
     
-    # Get non-dominant hand
-    dominant_hand = handedness.upper()
-    non_dominant_hand = "LEFT" if dominant_hand == "RIGHT" else "RIGHT"
+    # Domain, valence and snack are fixed for the session, so specialize the
+    # choice screen formatting and format the easy option once
+    easy_value = LOSS_EASY_VALUE if valence == 'Loss' else GAIN_EASY_VALUE
+    snack_packs = None
+    if domain == 'Food':
+        snack_name = info.get('snack_choice', 'snacks')
+        snack_packs = f"{snack_name.lower()} packs"
+    format_value, prob_labels = _make_formatters(domain, valence, snack_packs)
+    easy_display = format_value(easy_value)
     
     # Generate trial list
     trial_list = generate_trial_list(domain, valence)
     
-    # Randomize trial order
-    random.shuffle(trial_list)
+    # Randomize trial order (permutation drawn in C, then gathered once)
+    rng = np.random.default_rng()
+    trial_list = [trial_list[i] for i in rng.permutation(len(trial_list))]
+    
+    # Draw every inter-trial interval up front
+    itis = rng.uniform(ITI_RANGE[0], ITI_RANGE[1], size=len(trial_list))
     
     # List to store trial data
     trial_data_list = []
     
+    # Completed trials not yet written to the data file, and the file itself
+    # (opened, and closed, by main.py)
+    pending = []
+    trial_log = info['trial_log']
+    
     # Show initial experiment screen
     show_experiment_start(win)
     
@@ -67,87 +91,84 @@ def run_real_trials(win, info):
                 trial_params,
                 domain,
                 valence,
-                non_dominant_hand,
                 easy_clicks_required, 
                 hard_clicks_required,
                 subject_number,
                 handedness,
+                easy_display,
+                format_value,
+                prob_labels,
                 info
             )
             
             # Only save if trial was completed (not skipped)
             if trial_data is not None:
-                append_trial_data(info['data_file_path'], trial_data)
+                pending.append(trial_data)
                 trial_data_list.append(trial_data)
+                
+                # Write in batches; catch trials are flushed right away
+                if len(pending) >= TRIAL_WRITE_BATCH_SIZE or trial_data['is_catch']:
+                    trial_log.write_trials(pending)
+                    trial_log.flush()
+                    pending.clear()
             else:
                 logging.data(f"Skipped saving data for trial {trial_num}")
             
             # Inter-trial interval
-            iti = random.uniform(*ITI_RANGE)
-            core.wait(iti)
+            core.wait(float(itis[trial_num - 1]))
             
     except KeyboardInterrupt:
         # User pressed escape during trials -> let main.py handle the partial file renaming
         logging.data(f"[STRUCTURE] User interrupted during trial {trial_num}")
         raise  # Re-raise to let main.py handle it
+    
+    finally:
+        # Write any buffered trials so main.py counts them (also on interrupt)
+        trial_log.write_trials(pending)
         
     return trial_data_list
 
-def generate_trial_list(domain, valence):
+def _get_choice_borders(win):
     """
-    Generate list of trial parameters based on domain and valence.
-    Every participant gets the same set of trials, only the order is randomized.
+    Return the red confirmation borders for this window, building them on first use.
+    
+    The choice screen itself is shared with the practice trials
+    (practice_trials.get_choice_stims); the main block only adds one
+    prebuilt border per option instead of repositioning a single one.
     
     Parameters:
-    domain : str
-        'Money' or 'Food'
-    valence : str
-        'Gain' or 'Loss'
+    win : psychopy.visual.Window
+        Window to display stimuli
         
     Returns:
-    list
-        List of dictionaries containing trial parameters
+    (psychopy.visual.Rect, psychopy.visual.Rect)
+        Tuple of (easy option border, hard option border)
     """
-    trial_list = []
+    key = id(win)
+    if key in _choice_borders:
+        return _choice_borders[key]
     
-    # Generate regular trials
-    if domain == 'Money':
-        # For money: Use first 14 magnitudes (1.00 to 3.99) × 3 probabilities = 42 trials
-        money_magnitudes_14 = MONEY_MAGNITUDES[:14]  # Exclude the 4.00 value
-        
-        for mag in money_magnitudes_14:
-            for prob in PROBABILITIES:
-                trial_list.append({
-                    'magnitude_hard': mag,
-                    'probability': prob,
-                    'is_catch': False
-                })
-        
-        # Should have exactly 42 regular trials (14 × 3)
-        
-    else:  # Food
-        # For food: 4 magnitudes × 3 probabilities × 3 repetitions = 36 trials
-        for mag in FOOD_MAGNITUDES:
-            for prob in PROBABILITIES:
-                for _ in range(3):  # Exactly 3 repetitions of each combination
-                    trial_list.append({
-                        'magnitude_hard': mag,
-                        'probability': prob,
-                        'is_catch': False
-                    })
-        
-        # Should have exactly 36 regular trials (4 × 3 × 3)
-    
-    # Add catch trials (same for both domains)
-    catch_config = CATCH_TRIAL_CONFIGS[valence]
-    for _ in range(N_CATCH_TRIALS):
-        trial_list.append({
-            'magnitude_hard': catch_config['hard_value'],
-            'probability': catch_config['probability'],
-            'is_catch': True
-        })
-    
-    return trial_list
+    border_easy = visual.Rect(
+        win,
+        width=0.35,
+        height=0.18,
+        fillColor=None,
+        lineColor='red',
+        lineWidth=3,
+        pos=(-0.35, -0.15)
+    )
+    border_hard = visual.Rect(
+        win,
+        width=0.35,
+        height=0.18,
+        fillColor=None,
+        lineColor='red',
+        lineWidth=3,
+        pos=(0.35, -0.15)
+    )
+    
+    _choice_borders[key] = (border_easy, border_hard)
+    return _choice_borders[key]
 
 def show_experiment_start(win):
     """Show experiment start screen."""
@@ -172,7 +193,8 @@ def show_experiment_start(win):
     core.wait(1.0)
 
 def run_single_trial(win, trial_num, trial_params, domain, valence, 
-                    non_dominant_hand, easy_clicks_required, hard_clicks_required, subject_number, handedness, info):
+                    easy_clicks_required, hard_clicks_required, subject_number, handedness,
+                    easy_display, format_value, prob_labels, info):
     """
     Run a single experimental trial.
     
@@ -181,14 +203,12 @@ def run_single_trial(win, trial_num, trial_params, domain, valence,
         Window to display stimuli
     trial_num : int
         Trial number
-    trial_params : dict
+    trial_params : TrialParams
         Parameters for this trial (magnitude, probability, is_catch)
     domain : str
         'Money' or 'Food'
     valence : str
         'Gain' or 'Loss'
-    non_dominant_hand : str
-        Participant's non-dominant hand
     easy_clicks_required: int
         Number of clicks required for easy task
     hard_clicks_required : int
@@ -197,19 +217,22 @@ def run_single_trial(win, trial_num, trial_params, domain, valence,
         Subject ID
     handedness : str
         Participant's handedness
+    easy_display : str
+        Pre-formatted easy option value
+    format_value : callable
+        Session-specialized option value formatter from _make_formatters
+    prob_labels : dict
+        Probability label for each trial probability, from _make_formatters
+    info : dict
+        Subject information, including the 'dominant_hand' and
+        'non_dominant_hand' resolved once by main.py
         
     Returns:
     dict
         Dictionary containing all trial data
     """
-
-    # TODO: Modularize later and pass this as another parameter
-    dominant_hand = handedness.upper()
-
     # Extract trial parameters
-    magnitude_hard = trial_params['magnitude_hard']
-    probability = trial_params['probability']
-    is_catch = trial_params['is_catch']
+    magnitude_hard, probability, is_catch = trial_params
     
     # Set up values based on valence
     if valence == 'Loss':
@@ -226,31 +249,25 @@ def run_single_trial(win, trial_num, trial_params, domain, valence,
     # Calculate expected value
     ev = magnitude_hard * probability
     
-    # Initialize trial data
-    trial_data = {
-        'date': datetime.now().strftime('%Y-%m-%d'),
-        'time': datetime.now().strftime('%H:%M:%S'),
-        'subject': subject_number,
-        'handedness': handedness,
-        'practice_rounds_completed': info.get('practice_rounds_completed', 0),
-        'trial_num': trial_num,
-        'domain': domain,
-        'valence': valence,
-        'snack_choice': info.get('snack_choice', 'N/A'),
-        'magnitude_hard': magnitude_hard,
-        'probability': probability,
-        'EV': ev,
-        'choice': None,
-        'choice_rt': None,
-        'n_clicks_required': None,
-        'n_clicks_executed': 0,
-        'task_complete': 0,
-        'is_catch': int(is_catch)
-    }
+    # Initialize trial data from the template (date and time from a single
+    # clock sample)
+    trial_data = _TRIAL_TEMPLATE.copy()
+    trial_data['date'], trial_data['time'] = now_strings()
+    trial_data['subject'] = subject_number
+    trial_data['handedness'] = handedness
+    trial_data['practice_rounds_completed'] = info.get('practice_rounds_completed', 0)
+    trial_data['trial_num'] = trial_num
+    trial_data['domain'] = domain
+    trial_data['valence'] = valence
+    trial_data['snack_choice'] = info.get('snack_choice', 'N/A')
+    trial_data['magnitude_hard'] = magnitude_hard
+    trial_data['probability'] = probability
+    trial_data['EV'] = ev
+    trial_data['is_catch'] = int(is_catch)
     
     # Show choice screen and get response
     choice, choice_rt = show_experiment_choice_screen(
-        win, probability, magnitude_hard, easy_value, domain, valence, info
+        win, probability, magnitude_hard, easy_display, format_value, prob_labels
     )
 
     # Skip trial if timeout occurred
@@ -266,10 +283,10 @@ def run_single_trial(win, trial_num, trial_params, domain, valence,
     
     # Execute the chosen task
     if choice == 'easy':
-        task_complete, clicks_executed = run_easy_task(win, dominant_hand, easy_clicks_required)
+        task_complete, clicks_executed = run_easy_task(win, info['dominant_hand'], easy_clicks_required)
         trial_data['n_clicks_required'] = easy_clicks_required
     else:
-        task_complete, clicks_executed = run_hard_task(win, non_dominant_hand, hard_clicks_required)
+        task_complete, clicks_executed = run_hard_task(win, info['non_dominant_hand'], hard_clicks_required)
         trial_data['n_clicks_required'] = hard_clicks_required
     
     trial_data['n_clicks_executed'] = clicks_executed
@@ -284,197 +301,108 @@ def run_single_trial(win, trial_num, trial_params, domain, valence,
     
     return trial_data
 
-def show_experiment_choice_screen(win, probability, magnitude_hard, easy_value, domain, valence, info):
+def _make_formatters(domain, valence, snack_packs=None):
     """
-    Display choice screen for experimental trials with proper formatting for domain/valence.
+    Build the choice screen formatters for a session's fixed domain and valence.
     
+    Parameters:
+    domain : str
+        'Money' or 'Food'
+    valence : str
+        'Gain' or 'Loss'
+    snack_packs : str, optional
+        Snack unit label, required for the Food domain
+        
     Returns:
-    (str, float)
-        Tuple of (choice, reaction_time)
+    (callable, dict)
+        Tuple of (value formatter, e.g. -> '-$2.50' or '+3 m&ms packs',
+        probability label for every regular and catch trial probability,
+        e.g. {0.5: 'Probability of loss: 50%'})
     """
-    snack_packs = None
-    # Format values based on domain and valence
     if domain == 'Money':
         if valence == 'Loss':
-            easy_display = f"-${easy_value:.2f}"
-            hard_display = f"-${magnitude_hard:.2f}"
+            format_value = lambda value: f"-${value:.2f}"
         else:  # Gain
-            easy_display = f"+${easy_value:.2f}"
-            hard_display = f"+${magnitude_hard:.2f}"
+            format_value = lambda value: f"+${value:.2f}"
     else:  # Food
-        snack_name = info.get('snack_choice', 'snacks')
-        snack_packs = f"{snack_name.lower()} packs"
         if valence == 'Loss':
-            easy_display = f"-{int(easy_value)} {snack_packs}"
-            hard_display = f"-{int(magnitude_hard)} {snack_packs}"
+            format_value = lambda value: f"-{int(value)} {snack_packs}"
         else:  # Gain
-            easy_display = f"+{int(easy_value)} {snack_packs}"
-            hard_display = f"+{int(magnitude_hard)} {snack_packs}"
-    
-    # Set probability label based on valence
-    prob_label = f"Probability of {'loss' if valence == 'Loss' else 'gain'}: {int(probability * 100)}%"
-    
-    # Create visual elements
-    elements = []
-    
-    # Gray background box for FULL background
-    choice_bg = visual.Rect(
-        win,
-        width=2.0,
-        height=2.0,
-        fillColor=[0.2, 0.2, 0.2],
-        pos=(0, 0)
-    )
-    elements.append(choice_bg)
-    
-    fixation = visual.TextStim(
-        win, 
-        text="+", 
-        height=0.08, 
-        color='white',
-        pos=(0, 0) 
-    )
-    elements.append(fixation)
+            format_value = lambda value: f"+{int(value)} {snack_packs}"
+    
+    # Only a handful of probabilities occur, so every label is built up front
+    prob_word = 'loss' if valence == 'Loss' else 'gain'
+    catch_probability = CATCH_TRIAL_CONFIGS[valence]['probability']
+    prob_labels = {
+        p: f"Probability of {prob_word}: {int(p * 100)}%"
+        for p in PROBABILITIES + [catch_probability]
+    }
+    return format_value, prob_labels
 
-    # "Please choose a task:" text
-    instructions = visual.TextStim(
-        win,
-        text="Please choose a task:",
-        pos=(0, 0.25),
-        height=0.04,
-        color='white'
-    )
-    elements.append(instructions)
-    
-    # Probability text
-    probability_text = visual.TextStim(
-        win,
-        text=prob_label,
-        pos=(0, 0.15),
-        height=0.035,
-        color='white'
-    )
-    elements.append(probability_text)
-    
-    # Easy option box
-    easy_box = visual.Rect(
-        win,
-        width=0.35,
-        height=0.18,
-        fillColor=[0.6, 0.6, 0.6],
-        lineColor='white',
-        lineWidth=1,
-        pos=(-0.35, -0.15)
-    )
-    elements.append(easy_box)
-    
-    easy_label = visual.TextStim(
-        win,
-        text="Easy",
-        pos=(-0.35, -0.10),
-        height=0.035,
-        color='black',
-        bold=True
-    )
-    elements.append(easy_label)
-    
-    easy_value_text = visual.TextStim(
-        win,
-        text=easy_display,
-        pos=(-0.35, -0.20),
-        height=0.04,
-        color='black'
-    )
-    elements.append(easy_value_text)
-    
-    easy_key = visual.TextStim(
-        win,
-        text="(left arrow key)",
-        pos=(-0.35, -0.28),
-        height=0.025,
-        color='white'
-    )
-    elements.append(easy_key)
-    
-    # Hard option box
-    hard_box = visual.Rect(
-        win,
-        width=0.35,
-        height=0.18,
-        fillColor=[0.6, 0.6, 0.6],
-        lineColor='white',
-        lineWidth=1,
-        pos=(0.35, -0.15)
-    )
-    elements.append(hard_box)
-    
-    hard_label = visual.TextStim(
-        win,
-        text="Hard",
-        pos=(0.35, -0.10),
-        height=0.035,
-        color='black',
-        bold=True
-    )
-    elements.append(hard_label)
-    
-    hard_value_text = visual.TextStim(
-        win,
-        text=hard_display,
-        pos=(0.35, -0.20),
-        height=0.04,
-        color='black'
-    )
-    elements.append(hard_value_text)
+def show_experiment_choice_screen(win, probability, magnitude_hard, easy_display, format_value, prob_labels):
+    """
+    Display choice screen for experimental trials.
     
-    hard_key = visual.TextStim(
-        win,
-        text="(right arrow key)",
-        pos=(0.35, -0.28),
-        height=0.025,
-        color='white'
-    )
-    elements.append(hard_key)
+    Formatting for the session's domain/valence comes from the format_value
+    and prob_labels built by _make_formatters.
     
-    # Draw all elements
-    for element in elements:
-        element.draw()
+    Returns:
+    (str, float)
+        Tuple of (choice, reaction_time)
+    """
+    # Only the hard value changes between trials
+    hard_display = format_value(magnitude_hard)
+    
+    # Look up the prebuilt probability label
+    prob_label = prob_labels[probability]
+    
+    # Fill in the trial-specific text on the cached choice screen stimuli
+    stims = get_choice_stims(win)
+    stims['probability_text'].text = prob_label
+    if stims['easy_value'].text != easy_display:
+        stims['easy_value'].text = easy_display
+    stims['hard_value'].text = hard_display
+    draw_order = stims['elements']
+    
+    # Drain stale keypresses before the screen appears; waitKeys below must
+    # not clear again or it could drop a press made right after the flip
+    event.clearEvents(eventType='keyboard')
+    
+    # Draw all elements; the RT clock is reset at the flip itself
+    for stim in draw_order:
+        stim.draw()
+    rt_clock = core.Clock()
+    win.callOnFlip(rt_clock.reset)
     win.flip()
     
-    # Wait for response and record time
-    choice_start_time = core.getTime()
-    
+    # Wait for response, timestamped against the onset clock
     # In case there is a loss of focus:
-    choice_keys = event.waitKeys(keyList=['left', 'right', 'escape'], maxWait=30.0)
+    choice_keys = event.waitKeys(
+        maxWait=30.0,
+        keyList=['left', 'right', 'escape'],
+        timeStamped=rt_clock,
+        clearEvents=False
+    )
     if choice_keys is None:
         logging.warning("No response for 30 seconds - skipping trial due to timeout")
         return 'timeout', 30.0  # Return special timeout indicators
-
-    choice_end_time = core.getTime()
     
     # Check for escape key
-    if 'escape' in choice_keys:
+    if any(key == 'escape' for key, _ in choice_keys):
         logging.warning('User pressed escape during experiment')
         raise KeyboardInterrupt("User pressed escape during trial")
         
     # Record choice and reaction time
-    choice = 'easy' if choice_keys[0] == 'left' else 'hard'
-    choice_rt = choice_end_time - choice_start_time
+    key, choice_rt = choice_keys[0]
+    choice = 'easy' if key == 'left' else 'hard'
     
     # Show confirmation with red border
-    border_box = visual.Rect(
-        win,
-        width=0.35,
-        height=0.18,
-        fillColor=None,
-        lineColor='red',
-        lineWidth=3,
-        pos=(-0.35, -0.15) if choice == 'easy' else (0.35, -0.15)
-    )
+    border_easy, border_hard = _get_choice_borders(win)
+    border_box = border_easy if choice == 'easy' else border_hard
     
     # Redraw everything with highlight
-    for element in elements:
-        element.draw()
+    for stim in draw_order:
+        stim.draw()
     border_box.draw()
     win.flip()
     
@@ -3,9 +3,25 @@ subject_info.py
 Module to collect and validate participant information via PsychoPy GUI.
 """
 import os
-from datetime import datetime
+import re
 from psychopy import gui, logging, core
 
+# Data directory, resolved once (the working directory does not change
+# during a session)
+_DATA_DIR = os.path.join(os.getcwd(), 'data')
+
+# Subject numbers are ASCII digits only (str.isdigit also accepts other
+# Unicode digits, e.g. superscripts, that int() then rejects)
+_DIGITS_RE = re.compile(r'\A[0-9]+\Z')
+
+# Dropdown fields of the participant dialog and their options
+_DIALOG_CHOICES = {
+    'Domain': ['Money', 'Food'],
+    'Valence': ['Gain', 'Loss'],
+    'Handedness': ['Right', 'Left'],
+    'Practice Trials?': ['Yes', 'No']
+}
+
 def get_subject_info():
     """
     Collect and validate subject information through a GUI dialog.
@@ -24,85 +40,27 @@ def get_subject_info():
         - snack_choice (str): chosen snack if Food domain, None if Money domain
         - practice_trials (bool): True if practice block is desired
         - filename (str): Unique filename for data storage
+        - data_dir (str): Existing directory the data file goes in
         - base_filename (str): Base filename for partial data naming
     """
-    # Loop until all entries are valid (or user cancels)
+    # Define the dialog dictionaries once so a re-shown dialog keeps earlier entries
+    # Using lists as values creates dropdown menus in older PsychoPy versions
+    info = {'Subject Number': ''}
+    info.update((key, list(options)) for key, options in _DIALOG_CHOICES.items())
+    snack_info = {
+        'Snack Choice': ['M&Ms', 'Cheez-Its', 'Nut Mix', 'Mini Pretzels', 'Mini Ritz', 'Gummi Bears']
+    }
+    
+    # Collect core info, then the snack for the Food domain; only go back to
+    # the main dialog if the participant asks to change domain
     while True:
-        # Define a fresh info dictionary for each iteration
-        # Using lists as values creates dropdown menus in older PsychoPy versions
-        info = {
-            'Subject Number': '',
-            'Domain': ['Money', 'Food'],
-            'Valence': ['Gain', 'Loss'],
-            'Handedness': ['Right', 'Left'],
-            'Practice Trials?': ['Yes', 'No']
-        }
-        
-        # Create dialog
-        dlg = gui.DlgFromDict(
-            dictionary=info,
-            title='Participant Information',
-            sortKeys=False
-        )
-        
-        if not dlg.OK:
-            logging.error('User cancelled participant info dialog.')
-            core.quit()
-        
-        # Strip and extract
-        snum = info['Subject Number'].strip()
-        domain = info['Domain']
-        valence = info['Valence']
-        hand = info['Handedness']
-        practice = info['Practice Trials?']
-        
-        # Validate
-        errors = []
-        
-        if not snum:
-            errors.append("Subject Number is required")
-        elif not snum.isdigit():
-            errors.append("Subject Number must contain only digits")
-        
-        # Only show an error dialog if there are errors
-        if errors:
-            alert = gui.Dlg(title='Input Error')
-            for error in errors:
-                alert.addText(error)
-            alert.addText("\nPress OK to try again")
-            alert.show()
-            continue  # Re-display the main dialog
-            
-        # If validation passes, check for Food domain snack selection
-        if domain == 'Food':
-            snack_choice = None
-            while True:  # Loop until snack is selected or user goes back
-                snack_info = {
-                    'Snack Choice': ['M&Ms', 'Cheez-Its', 'Nut Mix', 'Mini Pretzels', 'Mini Ritz', 'Gummi Bears']
-                }
-                
-                snack_dlg = gui.DlgFromDict(
-                    dictionary=snack_info,
-                    title='Select Your Snack',
-                    sortKeys=False
-                )
-                
-                if not snack_dlg.OK:
-                    logging.data('User cancelled snack selection - returning to main dialog')
-                    snack_choice = None
-                    break  # Break out of snack selection
-                else:
-                    snack_choice = snack_info['Snack Choice']
-                    logging.data(f"[INFO] Snack selected: {snack_choice}")
-                    break  # Break out of snack selection loop
-            
-            # If no snack was selected (user cancelled), go back to main dialog
-            if snack_choice is None:
-                continue  # Go back to beginning of main while loop
-        else:
+        snum, domain, valence, hand, practice = _collect_core_info(info)
+        if domain != 'Food':
             snack_choice = None  # Money domain doesn't need snack selection
-        
-        break  # All validation and selection complete
+            break
+        snack_choice = _collect_snack(snack_info)
+        if snack_choice is not None:
+            break
     
     # Convert and finalize
     sub_num = int(snum)
@@ -110,22 +68,23 @@ def get_subject_info():
     valence_abbr = 'G' if valence == 'Gain' else 'L'
     
     # Create filename following spec: [subject number]_[domain]_[valence].csv
-    base_name = f"{sub_num}_{domain_abbr}_{valence_abbr}.csv"
-    filename = base_name
+    base_name = f"{sub_num}_{domain_abbr}_{valence_abbr}"
+    base_filename = base_name
     counter = 1
     
     # Avoid overwrite by appending 1, 2, etc.
-    data_dir = os.path.join(os.getcwd(), 'data')
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+    os.makedirs(_DATA_DIR, exist_ok=True)
+    
+    # List the directory once and resolve collisions against the names in memory
+    with os.scandir(_DATA_DIR) as entries:
+        existing = {entry.name for entry in entries}
         
-    while os.path.exists(os.path.join(data_dir, filename)):
-        filename = f"{sub_num}_{domain_abbr}_{valence_abbr}_{counter}.csv"
+    while f"{base_filename}.csv" in existing:
+        base_filename = f"{base_name}_{counter}"
         counter += 1
     
-    # Store the base name for partial file naming (without .csv extension)
-    base_name_no_ext = f"{sub_num}_{domain_abbr}_{valence_abbr}"
-    base_filename = f"{base_name_no_ext}_{counter}" if counter > 1 else base_name_no_ext
+    # base_filename (without .csv extension) is also used for partial file naming
+    filename = f"{base_filename}.csv"
 
     logging.data(f"[INFO] Subject info collected: ID={sub_num}, domain={domain}, valence={valence}")
 
@@ -140,5 +99,87 @@ def get_subject_info():
         'snack_choice': snack_choice,  # Will be None for Money domain
         'practice_trials': (practice == 'Yes'),
         'filename': filename,
+        'data_dir': _DATA_DIR,
         'base_filename': base_filename
-    }
\ No newline at end of file
+    }
+
+def _collect_core_info(info):
+    """
+    Show the participant dialog until it is filled in validly.
+    
+    Parameters:
+    info : dict
+        Dialog dictionary, kept by the caller so entries survive re-showing
+        
+    Returns:
+    tuple
+        (subject number str, domain, valence, handedness, practice 'Yes'/'No')
+    """
+    title = 'Participant Information'
+    
+    # Loop until all entries are valid (or user cancels)
+    while True:
+        # The dialog replaces each dropdown list with the chosen string, so
+        # rebuild the lists with the previous choice first (the default)
+        for key, options in _DIALOG_CHOICES.items():
+            if not isinstance(info[key], list):
+                chosen = info[key]
+                info[key] = [chosen] + [option for option in options if option != chosen]
+        
+        # Create dialog
+        dlg = gui.DlgFromDict(
+            dictionary=info,
+            title=title,
+            sortKeys=False
+        )
+        
+        if not dlg.OK:
+            logging.error('User cancelled participant info dialog.')
+            core.quit()
+        
+        # Strip and validate
+        snum = info['Subject Number'].strip()
+        if not snum:
+            error = "Subject Number is required"
+        elif not _DIGITS_RE.match(snum):
+            error = "Subject Number must contain only digits"
+        else:
+            return snum, info['Domain'], info['Valence'], info['Handedness'], info['Practice Trials?']
+        
+        # Re-display the main dialog with the error in its title instead of
+        # a separate alert dialog
+        title = f"Participant Information - {error}"
+
+def _collect_snack(snack_info):
+    """
+    Ask for the Food domain snack.
+    
+    Cancelling asks whether to change domain; answering No shows the snack
+    dialog again.
+    
+    Parameters:
+    snack_info : dict
+        Snack dialog dictionary
+        
+    Returns:
+    str or None
+        Chosen snack, or None if the participant wants to change domain
+    """
+    while True:
+        snack_dlg = gui.DlgFromDict(
+            dictionary=snack_info,
+            title='Select Your Snack',
+            sortKeys=False
+        )
+        
+        if snack_dlg.OK:
+            snack_choice = snack_info['Snack Choice']
+            logging.data(f"[INFO] Snack selected: {snack_choice}")
+            return snack_choice
+        
+        confirm = gui.Dlg(title='Snack Selection Cancelled', labelButtonOK='Yes', labelButtonCancel='No')
+        confirm.addText("Change domain?")
+        confirm.show()
+        if confirm.OK:
+            logging.data('User cancelled snack selection - returning to main dialog')
+            return None
@@ -0,0 +1,84 @@
+"""
+Tests for the effort task timer in practice_trials.py.
+"""
+import types
+import pytest
+
+pytest.importorskip('psychopy')
+
+import practice_trials
+from config import EASY_TASK_DURATION, HARD_TASK_DURATION
+
+
+def test_tenths_remaining_rounds_to_nearest_tenth():
+    assert practice_trials._tenths_remaining(10.0, 8.75) == 13  # 1.25s
+    assert practice_trials._tenths_remaining(10.0, 8.8) == 12   # 1.2s
+    assert practice_trials._tenths_remaining(10.0, 9.96) == 0   # 0.04s
+
+
+def test_tenths_remaining_is_zero_at_and_after_end_time():
+    assert practice_trials._tenths_remaining(10.0, 10.0) == 0
+    assert practice_trials._tenths_remaining(10.0, 12.5) == 0
+
+
+@pytest.mark.parametrize('duration', [EASY_TASK_DURATION, HARD_TASK_DURATION])
+def test_full_duration_indexes_timer_table(duration):
+    tenths = practice_trials._tenths_remaining(duration, 0.0)
+    assert tenths == round(duration * 10)
+    assert tenths < len(practice_trials._TIMER_STRS)
+    assert practice_trials._TIMER_STRS[tenths] == f"{duration:.1f}s"
+
+
+class _FakeClock:
+    """core.getTime() stand-in whose time base is far from zero."""
+    def __init__(self):
+        self.t = 1e6
+    
+    def getTime(self):
+        return self.t
+    
+    def wait(self, secs, hogCPUperiod=0.2):
+        self.t += secs
+
+
+class _FakeWin:
+    """Window whose flip() returns a timestamp that starts near zero, like logging's default clock."""
+    def __init__(self, clock):
+        self.clock = clock
+        self.flips = 0
+    
+    def flip(self):
+        self.clock.t += 1 / 60
+        self.flips += 1
+        return self.flips / 60
+
+
+class _FakeStim:
+    def __init__(self, win, **kwargs):
+        self.__dict__.update(kwargs)
+    
+    def draw(self):
+        pass
+
+
+class _FakeKeyboard:
+    def getKeys(self, keyList=None, waitRelease=True):
+        return []
+
+
+def test_click_task_times_out_when_flip_clock_differs(monkeypatch):
+    clock = _FakeClock()
+    win = _FakeWin(clock)
+    monkeypatch.setattr(practice_trials, 'core', types.SimpleNamespace(getTime=clock.getTime, wait=clock.wait))
+    monkeypatch.setattr(practice_trials, 'visual', types.SimpleNamespace(Rect=_FakeStim, TextStim=_FakeStim))
+    monkeypatch.setattr(practice_trials, '_get_keyboard', _FakeKeyboard)
+    
+    end_time = clock.getTime() + EASY_TASK_DURATION
+    complete, clicks = practice_trials._run_click_task(
+        win, 'space', 'label', 'easy', 0, 10, end_time
+    )
+    
+    # No presses: the task must end on the time limit, after redrawing the timer
+    assert (complete, clicks) == (False, 0)
+    assert clock.getTime() >= end_time
+    assert win.flips >= EASY_TASK_DURATION * 10
@@ -0,0 +1,61 @@
+"""
+trial_list.py
+Module for building the main block's trial list. Kept free of PsychoPy so
+trial lists can be generated and checked offline.
+"""
+import itertools
+from collections import namedtuple
+from config import (
+    MONEY_MAGNITUDES, FOOD_MAGNITUDES, PROBABILITIES, N_CATCH_TRIALS, CATCH_TRIAL_CONFIGS
+)
+
+# Fixed parameters of one main trial
+TrialParams = namedtuple('TrialParams', 'magnitude_hard probability is_catch')
+
+def generate_trial_list(domain, valence):
+    """
+    Generate list of trial parameters based on domain and valence.
+    Every participant gets the same set of trials, only the order is randomized.
+    
+    Parameters:
+    domain : str
+        'Money' or 'Food'
+    valence : str
+        'Gain' or 'Loss'
+        
+    Returns:
+    list
+        List of TrialParams (magnitude_hard, probability, is_catch)
+    """
+    trial_list = []
+    
+    # Generate regular trials
+    if domain == 'Money':
+        # For money: Use first 14 magnitudes (1.00 to 3.99) × 3 probabilities = 42 trials
+        money_magnitudes_14 = MONEY_MAGNITUDES[:14]  # Exclude the 4.00 value
+        
+        trial_list.extend(
+            TrialParams(mag, prob, False)
+            for mag, prob in itertools.product(money_magnitudes_14, PROBABILITIES)
+        )
+        
+        # Should have exactly 42 regular trials (14 × 3)
+        
+    else:  # Food
+        # For food: 4 magnitudes × 3 probabilities × 3 repetitions = 36 trials
+        base_combinations = [
+            TrialParams(mag, prob, False)
+            for mag, prob in itertools.product(FOOD_MAGNITUDES, PROBABILITIES)
+        ]
+        # Exactly 3 repetitions of each combination (entries are immutable,
+        # so repeats can share the same tuple)
+        trial_list.extend(base_combinations * 3)
+        
+        # Should have exactly 36 regular trials (4 × 3 × 3)
+    
+    # Add catch trials (same for both domains)
+    catch_config = CATCH_TRIAL_CONFIGS[valence]
+    catch_trial = TrialParams(catch_config['hard_value'], catch_config['probability'], True)
+    trial_list.extend([catch_trial] * N_CATCH_TRIALS)
+    
+    return trial_list
@@ -3,9 +3,12 @@ utils.py
 Module to set up experiment logging and save data to CSV.
 """
 import os
+import io
 import csv
+from dataclasses import dataclass
 from datetime import datetime
 from psychopy import logging
+from config import TRIAL_COLUMNS
 
 def setup_logging(info=None, log_dir='logs'):
     """
@@ -25,8 +28,7 @@ def setup_logging(info=None, log_dir='logs'):
         Path to the created log file
     """
     # Ensure log directory exists
-    if not os.path.isdir(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
     
     # Generate filename based on subject info or timestamp
     if info and all(k in info for k in ['subject_number', 'domain', 'valence']):
@@ -37,17 +39,20 @@ def setup_logging(info=None, log_dir='logs'):
         
         # Create base filename
         base_name = f"{sub_num}_{domain_abbr}_{valence_abbr}"
-        log_filename = f"{log_dir}/{base_name}.log"
         
-        # Handle duplicates
+        # Handle duplicates (one directory listing, then in-memory checks)
+        with os.scandir(log_dir) as entries:
+            existing = {entry.name for entry in entries}
+        log_name = f"{base_name}.log"
         counter = 1
-        while os.path.exists(log_filename):
-            log_filename = f"{log_dir}/{base_name}_{counter}.log"
+        while log_name in existing:
+            log_name = f"{base_name}_{counter}.log"
             counter += 1
+        log_filename = os.path.join(log_dir, log_name)
     else:
         # Fallback to timestamp if no info provided
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_filename = f"{log_dir}/experiment_{timestamp}.log"
+        log_filename = os.path.join(log_dir, f"experiment_{timestamp}.log")
     
     # Set up PsychoPy log file
     logging.LogFile(log_filename, level=logging.DATA)
@@ -58,31 +63,74 @@ def setup_logging(info=None, log_dir='logs'):
     
     return log_filename
 
+@dataclass
+class TrialLog:
+    """
+    Open trial data file with its CSV writer and a count of the data rows written.
+    
+    Keeping the count here lets the number of saved trials be read without
+    rescanning the file. Use as a context manager around the trial block to
+    sync and close the file when the block ends, including on escape.
+    """
+    filepath: str
+    csvfile: io.TextIOBase
+    writer: csv.DictWriter
+    n_rows: int = 0
+    
+    def write_trials(self, trials):
+        """Write a batch of trial rows and add them to the row count."""
+        self.writer.writerows(trials)
+        self.n_rows += len(trials)
+    
+    def flush(self):
+        """Push written rows from the file buffer to the OS."""
+        self.csvfile.flush()
+    
+    def close(self):
+        """Flush, sync the file to disk and close it (no-op once closed)."""
+        if not self.csvfile.closed:
+            self.csvfile.flush()
+            os.fsync(self.csvfile.fileno())
+            self.csvfile.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 def create_data_file(filepath):
-    """Create empty CSV file with headers."""
-    headers = [
-        'date', 'time', 'subject', 'handedness', 'practice_rounds_completed', 'trial_num', 
-        'domain', 'valence', 'snack_choice', 'magnitude_hard', 'probability', 'EV',
-        'choice', 'choice_rt', 'n_clicks_required', 'n_clicks_executed', 
-        'task_complete', 'is_catch', 'trial_type'
-    ]
-    
-    with open(filepath, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=headers)
-        writer.writeheader()
+    """
+    Create the CSV data file with headers and keep it open for appending trials.
+    
+    Trials are written through the returned TrialLog for the rest of the
+    session instead of reopening the file per trial. The caller owns the
+    open file and must close it (e.g. by using the TrialLog in a with block).
+    
+    Parameters:
+    filepath : str
+        Path to the trial data CSV
+        
+    Returns:
+    TrialLog
+        Open file, writer using TRIAL_COLUMNS, and a row count of 0
+    """
+    csvfile = open(filepath, 'w', newline='', buffering=1 << 16)
+    writer = csv.DictWriter(csvfile, fieldnames=TRIAL_COLUMNS)
+    writer.writeheader()
+    csvfile.flush()
     
     logging.data(f"[STRUCTURE] Data file created: {filepath}")
+    return TrialLog(filepath, csvfile, writer)
 
-def append_trial_data(filepath, trial_data):
-    """Append single trial data to existing CSV file."""
-    with open(filepath, 'a', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=trial_data.keys())
-        writer.writerow(trial_data)
-
-def count_trials_in_file(filepath):
-    """Count number of data rows in CSV file."""
-    try:
-        with open(filepath, 'r') as csvfile:
-            return sum(1 for line in csvfile) - 1  # Subtract header row
-    except FileNotFoundError:
-        return 0
\ No newline at end of file
+def now_strings():
+    """
+    Return the current local date and time as written to the data file.
+    
+    Returns:
+    (str, str)
+        Tuple of ('YYYY-MM-DD', 'HH:MM:SS') taken from a single clock read
+    """
+    now = datetime.now()
+    # Fixed-width fields, formatted directly rather than through strftime
+    return now.date().isoformat(), f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"